@@ -1,10 +1,21 @@
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import httpx
+import importlib.util
+from bs4 import BeautifulSoup, SoupStrainer
 import google.generativeai as genai
-from urllib.parse import urljoin
-import random
-from collections import defaultdict
+from google.ai import generativelanguage as glm
+from urllib.parse import urljoin, urlsplit, urlunsplit
+import posixpath
+import zlib
+import hashlib
+import re
+import diskcache
+import orjson
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # -------------------------------
 # 1. 환경설정 및 세션 상태 초기화
@@ -18,9 +29,26 @@ if "messages_chat" not in st.session_state:
 if "book_metadata" not in st.session_state:
     st.session_state.book_metadata = {}
 if "loan_stats" not in st.session_state:
-    st.session_state.loan_stats = defaultdict(lambda: {"rank": random.randint(1, 50), "count": random.randint(1, 300)})
-if "feedback" not in st.session_state:
-    st.session_state.feedback = defaultdict(list)
+    st.session_state.loan_stats = {}
+
+@st.cache_resource
+def get_db():
+    """도서 분석 결과(URL 단위)와 피드백을 저장하는 SQLite DB"""
+    db = sqlite3.connect("books.db", check_same_thread=False)
+    db.execute("CREATE TABLE IF NOT EXISTS books(url TEXT PRIMARY KEY, json BLOB)")
+    db.execute("CREATE TABLE IF NOT EXISTS feedback(book_title TEXT, meta_type TEXT, feedback TEXT)")
+    db.execute("CREATE INDEX IF NOT EXISTS feedback_key ON feedback(book_title, meta_type)")
+    db.commit()
+    return db
+
+@st.cache_resource
+def get_db_lock():
+    """세션 간 공유 연결에서 트랜잭션이 섞이지 않도록 쓰기를 직렬화"""
+    return threading.Lock()
+
+def db_write(sql, params):
+    with get_db_lock(), get_db() as db:
+        db.execute(sql, params)
 
 # -------------------------------
 # 2. Gemini API Key 입력
@@ -32,36 +60,176 @@ genai.configure(api_key=gemini_api_key) if gemini_api_key else None
 # -------------------------------
 # 3. 크롤러 함수 (샘플: YES24, 교보문고, 대학도서관)
 # -------------------------------
-def crawl_book_metadata(url, max_pages=1):
+CRAWL_CONCURRENCY = 8  # 동시 요청 수 제한
+HTTP_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; chatbothw-crawler/1.0)"}
+# 같은 호스트로의 keep-alive 연결을 재사용하도록 커넥션 풀 크기 지정
+HTTP_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+# HTTP/2는 h2 패키지(httpx[http2])가 있을 때만 사용, 없으면 HTTP/1.1
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+MAX_PAGE_BYTES = 2 * 1024 * 1024  # 페이지당 최대 수신 크기
+# 사용하는 태그(제목, 메타, 링크, 본문 텍스트)만 파싱
+PAGE_STRAINER = SoupStrainer(["title", "meta", "a", "body"])
+
+def head_text(soup, n):
+    """본문 텍스트를 앞에서부터 n자까지만 모아 반환 (전체 문자열 생성 방지)"""
+    buf = []
+    total = 0
+    for s in soup.stripped_strings:
+        buf.append(s)
+        total += len(s) + 1
+        if total >= n:
+            break
+    return " ".join(buf)[:n]
+
+def select_text(soup, selector):
+    node = soup.select_one(selector)
+    return node.get_text(" ", strip=True) if node else None
+
+def find_year(text):
+    match = re.search(r"(?:19|20)\d{2}", text or "")
+    return match.group(0) if match else None
+
+def parse_yes24(soup):
+    """YES24 상품 상세 페이지 전용 파서"""
+    return {
+        "title": select_text(soup, "#yDetailTopWrap .gd_name"),
+        "author": select_text(soup, "#yDetailTopWrap .gd_auth"),
+        "summary": select_text(soup, "#infoset_introduce .infoWrap_txt"),
+        "pub_year": find_year(select_text(soup, "#yDetailTopWrap .gd_date")),
+    }
+
+def parse_kyobo(soup):
+    """교보문고 상품 상세 페이지 전용 파서"""
+    return {
+        "title": select_text(soup, ".prod_title"),
+        "author": select_text(soup, ".prod_author_box .author"),
+        "summary": select_text(soup, ".intro_bottom .info_text"),
+        "pub_year": find_year(select_text(soup, ".prod_info_wrap .date")),
+    }
+
+# 호스트별 전용 파서 (platform_host로 정규화한 호스트 기준, 없는 호스트는 범용 추출만 사용)
+PLATFORM_PARSERS = {
+    "yes24.com": parse_yes24,
+    "product.kyobobook.co.kr": parse_kyobo,
+}
+
+def platform_host(netloc):
+    """포트와 www./m. 접두사를 떼어 같은 플랫폼의 호스트를 하나로 취급"""
+    host = netloc.lower().rsplit("@", 1)[-1].split(":", 1)[0]
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            return host[len(prefix):]
+    return host
+
+HREF_STRIP_CHARS = "".join(map(chr, range(0x21)))  # 앞뒤 공백/제어문자
+HREF_REMOVE_CHARS = str.maketrans("", "", "\t\r\n")  # 중간의 탭/줄바꿈
+
+def clean_href(href):
+    """브라우저/urlsplit과 같이 앞뒤 공백·제어문자와 탭/줄바꿈 제거"""
+    return href.strip(HREF_STRIP_CHARS).translate(HREF_REMOVE_CHARS)
+
+def join_fast(base_split, href):
+    """미리 분해한 기준 URL(base_split)에 href를 결합 (urljoin의 반복 파싱 회피, 프래그먼트는 항상 제거)"""
+    href = clean_href(href).split("#", 1)[0]
+    if not href:
+        return urlunsplit(base_split._replace(fragment=""))
+    if href.startswith(("http://", "https://")):
+        return href
+    if href.startswith("//"):
+        return f"{base_split.scheme}:{href}"
+    if href.startswith("?") or ":" in href.split("/", 1)[0]:
+        # 쿼리만 있는 링크, 기타 스킴 등은 표준 결합 사용
+        return urljoin(urlunsplit(base_split._replace(fragment="")), href)
+    path, _, query = href.partition("?")
+    if not path.startswith("/"):
+        path = posixpath.dirname(base_split.path) + "/" + path
+    trailing_slash = path.endswith("/") or path.endswith("/.") or path.endswith("/..")
+    path = posixpath.normpath(path).lstrip("/")
+    path = "/" + path + ("/" if trailing_slash and path else "")
+    return urlunsplit((base_split.scheme, base_split.netloc, path, query, ""))
+
+async def crawl_book_metadata(url, max_pages=1):
     """플랫폼별 도서 메타데이터 자동 크롤링 및 키워드 추출"""
     try:
         content_dict = {}
         visited = set()
-        to_visit = [url]
-        while to_visit and len(visited) < max_pages:
-            current_url = to_visit.pop(0)
-            if current_url in visited:
-                continue
-            response = requests.get(current_url, timeout=5)
-            soup = BeautifulSoup(response.content, "html.parser")
-            # 샘플: 제목, 저자, 출판사, 연도, 요약, 서평, 영상화 여부 등 추출
-            title = soup.title.string if soup.title else "제목 없음"
-            summary = soup.find("meta", {"name": "description"})
-            summary = summary["content"] if summary else soup.get_text()[:500]
-            # 실제 서비스에서는 각 플랫폼별 HTML 구조에 맞게 파싱 필요
-            content_dict[current_url] = {
-                "title": title,
-                "summary": summary,
-                "content": soup.get_text()[:2000],
-                "external_links": [current_url],
-                "platform": url.split("/")[2]
-            }
-            visited.add(current_url)
-            # 내부 링크 추가(샘플)
-            for link in soup.find_all("a", href=True):
-                child_url = urljoin(url, link['href'])
-                if child_url.startswith(url) and child_url not in visited and child_url not in to_visit:
-                    to_visit.append(child_url)
+        to_visit = deque([url])
+        queued = {url}
+        base_host = platform_host(urlsplit(url).netloc)
+        semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+        async with httpx.AsyncClient(
+            timeout=5, http2=HTTP2_ENABLED, follow_redirects=True, headers=HTTP_HEADERS, limits=HTTP_LIMITS
+        ) as client:
+
+            async def fetch_page(page_url):
+                # 요청은 동시 실행, HTML 파싱은 스레드에서 처리해 다음 요청과 겹치게 함
+                # 본문을 청크 단위로 받아 MAX_PAGE_BYTES 이상은 내려받지 않음
+                chunks = []
+                size = 0
+                async with semaphore:
+                    async with client.stream("GET", page_url) as response:
+                        response.raise_for_status()
+                        async for chunk in response.aiter_bytes(8192):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= MAX_PAGE_BYTES:
+                                break
+                html = b"".join(chunks)
+                # 리다이렉트 후 최종 URL 기준으로 파서 선택/링크 결합
+                return str(response.url), await asyncio.to_thread(BeautifulSoup, html, "lxml", parse_only=PAGE_STRAINER)
+
+            while to_visit and len(visited) < max_pages:
+                batch = []
+                while to_visit and len(visited) + len(batch) < max_pages:
+                    candidate = to_visit.popleft()
+                    if candidate not in visited and candidate not in batch:
+                        batch.append(candidate)
+                pages = await asyncio.gather(*[fetch_page(u) for u in batch], return_exceptions=True)
+                for page_url, page in zip(batch, pages):
+                    # 실패한 하위 페이지는 건너뛰고, 시작 URL이 실패한 경우에만 크롤링 실패 처리
+                    if isinstance(page, Exception):
+                        if page_url == url:
+                            raise page
+                        continue
+                    current_url = page_url
+                    final_url, soup = page
+                    # 샘플: 제목, 저자, 출판사, 연도, 요약, 서평, 영상화 여부 등 추출
+                    title = soup.title.string if soup.title else "제목 없음"
+                    text = head_text(soup, 2000)
+                    summary = soup.find("meta", {"name": "description"})
+                    summary = summary["content"] if summary else text[:500]
+                    # 실제 서비스에서는 각 플랫폼별 HTML 구조에 맞게 파싱 필요
+                    content_dict[current_url] = {
+                        "title": title,
+                        "summary": summary,
+                        "content": text[:2000],
+                        "external_links": [current_url],
+                        "platform": url.split("/")[2]
+                    }
+                    base_split = urlsplit(final_url)
+                    parser = PLATFORM_PARSERS.get(platform_host(base_split.netloc))
+                    if parser:
+                        fields = {k: v for k, v in parser(soup).items() if v}
+                        content_dict[current_url].update(fields)
+                        # 구조화된 소개글이 충분히 길면 메뉴 등 잡다한 본문 대신 AI 분석에 사용
+                        if "summary" in fields:
+                            structured = "\n".join(
+                                f"{k}: {fields[k]}" for k in ("title", "author", "pub_year", "summary") if k in fields
+                            )[:2000]
+                            if not is_content_too_short(structured):
+                                content_dict[current_url]["content"] = structured
+                    visited.add(current_url)
+                    # 내부 링크 추가(샘플)
+                    for link in soup.find_all("a", href=True):
+                        href = clean_href(link['href'])
+                        if not href or href.startswith(("#", "javascript:", "mailto:")):
+                            continue
+                        child_url = join_fast(base_split, href)
+                        if platform_host(urlsplit(child_url).netloc) != base_host:
+                            continue
+                        if child_url not in visited and child_url not in queued:
+                            to_visit.append(child_url)
+                            queued.add(child_url)
         return content_dict
     except Exception as e:
         st.warning(f"크롤링 오류: {str(e)}")
@@ -70,50 +238,163 @@ def crawl_book_metadata(url, max_pages=1):
 # -------------------------------
 # 4. 생성형 AI 기반 메타데이터/키워드 추출
 # -------------------------------
-def generate_metadata_ai(book_content):
-    """생성형 AI로 인물, 사건, 배경, 감정 등 키워드 및 메타데이터 추출"""
-    prompt = f"""
-    다음 도서 내용을 분석하여 아래 항목별로 정보를 추출해줘.
+@st.cache_resource
+def get_generative_client(api_key):
+    """API 키별 Gemini 클라이언트 (HTTP/2 gRPC 채널 하나를 모든 호출이 공유)"""
+    return glm.GenerativeServiceClient(client_options={"api_key": api_key}, transport="grpc")
+
+@st.cache_resource
+def get_model(api_key):
+    """API 키별로 Gemini 모델 핸들을 한 번만 생성해 재사용"""
+    model = genai.GenerativeModel("gemini-pro")
+    # 전역 genai.configure 상태(다른 세션이 바꿀 수 있음) 대신 이 키의 클라이언트를 고정
+    model._client = get_generative_client(api_key)
+    return model
+
+@st.cache_resource
+def get_response_cache():
+    """프롬프트 해시 → 응답 텍스트를 저장하는 디스크 캐시"""
+    return diskcache.Cache("./.gemini_cache")
+
+def prompt_key(prompt):
+    return hashlib.blake2b(prompt.encode("utf-8")).hexdigest()
+
+def cached_generate(prompt):
+    """동일 프롬프트는 Gemini를 다시 호출하지 않고 캐시된 응답 반환"""
+    cache = get_response_cache()
+    key = prompt_key(prompt)
+    text = cache.get(key)
+    if text is None:
+        text = get_model(gemini_api_key).generate_content(prompt).text
+        cache.set(key, text)
+    return text
+
+def stream_generate(prompt):
+    """응답을 생성되는 대로 청크 단위로 반환 (완료 후 캐시에 저장)"""
+    cache = get_response_cache()
+    key = prompt_key(prompt)
+    text = cache.get(key)
+    if text is not None:
+        yield text
+        return
+    chunks = []
+    for chunk in get_model(gemini_api_key).generate_content(prompt, stream=True):
+        chunks.append(chunk.text)
+        yield chunk.text
+    cache.set(key, "".join(chunks))
+
+METADATA_FIELDS = """
     - 인물/주요 등장인물
     - 주요 사건/갈등
     - 시대적 배경
     - 감정적 요소(애증, 고독감 등)
     - 영상화 여부(영화/드라마/웹툰 등, 플랫폼명 포함)
     - 서평(간략 요약)
-    - 외부링크(있으면)
+    - 외부링크(있으면)"""
+METADATA_ERROR = "AI 메타데이터 생성 오류"
+METADATA_SKIPPED = "(내용 부족 - AI 분석 생략)"
+MIN_CONTENT_LENGTH = 200  # 이보다 짧은 내용(오류/리다이렉트 페이지 등)은 분석하지 않음
+METADATA_BATCH_SIZE = 4  # 한 번의 Gemini 요청에 묶는 도서 수
+PROMPT_CONTENT_BYTES = 4500  # 프롬프트에 넣는 도서 내용 최대 크기 (UTF-8 바이트, 한글 약 1500자)
+
+def truncate_utf8(text, limit=PROMPT_CONTENT_BYTES):
+    """UTF-8 바이트 기준으로 자르기 (잘린 글자는 버림)"""
+    return text.encode("utf-8")[:limit].decode("utf-8", "ignore")
+
+def is_content_too_short(book_content):
+    return not book_content or len(book_content.strip()) < MIN_CONTENT_LENGTH
+
+def generate_metadata_ai(book_content):
+    """생성형 AI로 인물, 사건, 배경, 감정 등 키워드 및 메타데이터 추출"""
+    if is_content_too_short(book_content):
+        return METADATA_SKIPPED
+    content = truncate_utf8(book_content)
+    prompt = f"""
+    다음 도서 내용을 분석하여 아래 항목별로 정보를 추출해줘.{METADATA_FIELDS}
     [도서 내용]
-    {book_content[:1500]}
+    {content}
     """
     try:
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
-        return response.text
+        return cached_generate(prompt)
     except Exception as e:
-        return f"AI 메타데이터 생성 오류: {str(e)}"
+        return f"{METADATA_ERROR}: {str(e)}"
+
+def generate_metadata_ai_batch(contents):
+    """여러 도서를 한 번의 Gemini 요청으로 분석 (입력 순서대로 결과 반환)"""
+    # 내용이 부족한 도서는 묶음 요청에서 제외
+    skipped = [is_content_too_short(c) for c in contents]
+    if any(skipped):
+        results = iter(generate_metadata_ai_batch([c for c, skip in zip(contents, skipped) if not skip]))
+        return [METADATA_SKIPPED if skip else next(results) for skip in skipped]
+    if len(contents) <= 1:
+        return [generate_metadata_ai(c) for c in contents]
+    books = "\n\n".join(f"=== BOOK {i} ===\n{truncate_utf8(c)}" for i, c in enumerate(contents))
+    prompt = f"""
+    다음 {len(contents)}권의 도서 내용을 각각 분석하여 아래 항목별로 정보를 추출해줘.{METADATA_FIELDS}
+    각 도서의 결과는 "=== META 번호 ===" 한 줄로 시작하고, 번호는 BOOK 번호와 같게 해줘.
+    [도서 내용]
+    {books}
+    """
+    try:
+        text = cached_generate(prompt)
+    except Exception as e:
+        return [f"{METADATA_ERROR}: {str(e)}"] * len(contents)
+    parts = re.split(r"^\s*=== META (\d+) ===\s*$", text, flags=re.MULTILINE)
+    metas = {int(i): meta.strip() for i, meta in zip(parts[1::2], parts[2::2])}
+    # 응답에서 빠진 도서는 개별 요청으로 보완
+    return [metas.get(i) or generate_metadata_ai(c) for i, c in enumerate(contents)]
 
 # -------------------------------
 # 5. 대출순위/대출횟수 샘플 함수
 # -------------------------------
 def get_loan_stats(title):
     """로그 분석 기반 대출순위/횟수(샘플)"""
-    stats = st.session_state.loan_stats[title]
-    return stats["rank"], stats["count"]
+    stats = st.session_state.loan_stats.get(title)
+    if stats is None:
+        # 제목 기반 고정 값(세션이 바뀌어도 동일)
+        h = zlib.crc32(str(title).encode("utf-8"))
+        stats = (h % 50 + 1, (h >> 8) % 300 + 1)
+        st.session_state.loan_stats[title] = stats
+    return stats
 
 # -------------------------------
 # 6. 피드백 저장 함수
 # -------------------------------
 def save_feedback(book_title, meta_type, feedback_text):
-    st.session_state.feedback[(book_title, meta_type)].append(feedback_text)
+    db_write("INSERT INTO feedback VALUES (?, ?, ?)", (book_title, meta_type, feedback_text))
 
 # -------------------------------
 # 7. 도서 검색 및 메타데이터 생성 파이프라인
 # -------------------------------
+METADATA_WORKERS = 8  # 동시 Gemini 호출 수
+
 def search_and_extract(url):
+    # 0) 이미 분석한 URL이면 저장된 결과 사용
+    row = get_db().execute("SELECT json FROM books WHERE url = ?", (url,)).fetchone()
+    if row:
+        crawled = orjson.loads(row[0])
+        for data in crawled.values():
+            st.session_state.book_metadata[data["title"]] = data
+        return crawled
     # 1) 크롤링
-    crawled = crawl_book_metadata(url)
-    # 2) AI 메타데이터 생성
-    for u, data in crawled.items():
-        ai_meta = generate_metadata_ai(data["content"])
+    crawled = asyncio.run(crawl_book_metadata(url))
+    # 2) AI 메타데이터 생성 (같은 내용은 한 번만, 여러 페이지를 묶어 요청하고 묶음끼리는 병렬 처리)
+    pages = list(crawled.values())
+    keys = [
+        hashlib.blake2b(truncate_utf8(d["content"]).encode("utf-8"), digest_size=16).digest()
+        for d in pages
+    ]
+    unique = {}
+    for key, data in zip(keys, pages):
+        unique.setdefault(key, data["content"])
+    contents = list(unique.values())
+    batches = [contents[i:i + METADATA_BATCH_SIZE] for i in range(0, len(contents), METADATA_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as ex:
+        futures = [ex.submit(generate_metadata_ai_batch, batch) for batch in batches]
+    seen = dict(zip(unique, (meta for fut in futures for meta in fut.result())))
+    # 결과 반영은 크롤링 순서대로 (마지막 도서가 질의 대상이 되므로)
+    for data, key in zip(pages, keys):
+        ai_meta = seen[key]
         # 간단 파싱(실제 서비스는 구조화 필요)
         data["ai_metadata"] = ai_meta
         # 대출 데이터
@@ -121,6 +402,11 @@ def search_and_extract(url):
         data["loan_rank"] = rank
         data["loan_count"] = count
         st.session_state.book_metadata[data["title"]] = data
+    # 3) 모든 페이지가 정상 분석된 결과만 저장 (오류/내용 부족 페이지가 있으면 다음 검색 때 재시도)
+    if crawled and not any(
+        d["ai_metadata"].startswith(METADATA_ERROR) or d["ai_metadata"] == METADATA_SKIPPED for d in pages
+    ):
+        db_write("INSERT OR REPLACE INTO books VALUES (?, ?)", (url, orjson.dumps(crawled)))
     return crawled
 
 # -------------------------------
@@ -150,6 +436,8 @@ with tab_query:
             if results:
                 for title, data in results.items():
                     st.markdown(f"### {data['title']}")
+                    if data.get("author"):
+                        st.write(f"**저자:** {data['author']} / **출간연도:** {data.get('pub_year', '-')}")
                     st.write(f"**요약:** {data['summary']}")
                     st.write(f"**AI 메타데이터:**\n{data['ai_metadata']}")
                     st.write(f"**대출순위:** {data['loan_rank']}위 / **대출횟수:** {data['loan_count']}회")
@@ -181,11 +469,10 @@ with tab_query:
             [질문]
             {user_query}
             """
-            model = genai.GenerativeModel("gemini-pro")
-            response = model.generate_content(prompt)
+            st.markdown("**AI 답변:**")
+            answer = st.write_stream(stream_generate(prompt))
             st.session_state.messages_query.append(("user", user_query))
-            st.session_state.messages_query.append(("ai", response.text))
-            st.markdown(f"**AI 답변:**\n{response.text}")
+            st.session_state.messages_query.append(("ai", answer))
         else:
             st.info("먼저 도서 검색을 진행해주세요.")
 
@@ -207,10 +494,8 @@ with tab_chat:
         {context}
         자유로운 문학 토론, 감정 공유, 다양한 관점 제시를 부탁해.
         """
-        model = genai.GenerativeModel("gemini-pro")
-        response = model.generate_content(prompt)
-        st.session_state.messages_chat.append(("ai", response.text))
-        st.chat_message("assistant").write(response.text)
+        answer = st.chat_message("assistant").write_stream(stream_generate(prompt))
+        st.session_state.messages_chat.append(("ai", answer))
 
     # 대화 히스토리
     for role, msg in st.session_state.messages_chat:
@@ -219,11 +504,23 @@ with tab_chat:
 # -------------------------------
 # 11. 피드백 분석 및 통계
 # -------------------------------
+FEEDBACK_TOP_K = 20  # 피드백이 많은 상위 항목만 표시
+
 st.sidebar.title("📊 피드백/로그 통계")
 if st.sidebar.button("피드백 통계 보기"):
-    for (book_title, meta_type), fb_list in st.session_state.feedback.items():
-        st.sidebar.write(f"도서: {book_title} / 항목: {meta_type} / 피드백 수: {len(fb_list)}")
-        for fb in fb_list:
+    db = get_db()
+    top = db.execute(
+        "SELECT book_title, meta_type, COUNT(*) AS n FROM feedback "
+        "GROUP BY book_title, meta_type ORDER BY n DESC LIMIT ?",
+        (FEEDBACK_TOP_K,),
+    ).fetchall()
+    for book_title, meta_type, n in top:
+        st.sidebar.write(f"도서: {book_title} / 항목: {meta_type} / 피드백 수: {n}")
+        fb_rows = db.execute(
+            "SELECT feedback FROM feedback WHERE book_title = ? AND meta_type = ? ORDER BY rowid",
+            (book_title, meta_type),
+        )
+        for (fb,) in fb_rows:
             st.sidebar.write(f"- {fb}")
 
 # -------------------------------
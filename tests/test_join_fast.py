@@ -0,0 +1,56 @@
+import ast
+import pathlib
+import posixpath
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+import pytest
+
+# ailib.py는 Streamlit 스크립트라 import 시 UI가 실행되므로, 필요한 정의만 골라 로드
+SOURCE = pathlib.Path(__file__).resolve().parent.parent / "ailib.py"
+NAMES = {"HREF_STRIP_CHARS", "HREF_REMOVE_CHARS", "clean_href", "join_fast"}
+
+
+def load_helpers():
+    tree = ast.parse(SOURCE.read_text(encoding="utf-8"))
+    nodes = [
+        node for node in tree.body
+        if (isinstance(node, ast.FunctionDef) and node.name in NAMES)
+        or (isinstance(node, ast.Assign) and any(getattr(t, "id", None) in NAMES for t in node.targets))
+    ]
+    namespace = {"posixpath": posixpath, "urljoin": urljoin, "urlunsplit": urlunsplit}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(SOURCE), "exec"), namespace)
+    return namespace["clean_href"], namespace["join_fast"]
+
+
+clean_href, join_fast = load_helpers()
+
+BASES = [
+    "https://h.com/Product/Goods/123",
+    "https://h.com/a/b/",
+    "https://h.com",
+    "https://h.com/x/y.html?q=1",
+]
+HREFS = [
+    "foo", "./foo", "../foo", "../../../foo", "/abs", "/abs/", "sub/", "?x=1",
+    "foo?a=b#c", "c#f", "//b.com/p", "https://c.com/z", "https://c.com/z#frag",
+    "mailto:x", "a/./b/../c", ".", "..", "./", "foo/..", "#top", "",
+    " /c", "/c ", "\t/c\n", "a\nb", " https://c.com/z#y ",
+]
+
+
+@pytest.mark.parametrize("base", BASES)
+@pytest.mark.parametrize("href", HREFS)
+def test_join_fast_matches_urljoin(base, href):
+    expected = urldefrag(urljoin(base, clean_href(href))).url
+    assert join_fast(urlsplit(base), href) == expected
+
+
+def test_join_fast_strips_whitespace():
+    assert join_fast(urlsplit("https://h.com/a/b/"), " /c") == "https://h.com/c"
+
+
+def test_join_fast_drops_fragment_on_every_branch():
+    base = urlsplit("https://h.com/a/b/")
+    assert join_fast(base, "c#f") == "https://h.com/a/b/c"
+    assert join_fast(base, "https://h.com/a/b/c#f") == "https://h.com/a/b/c"
+    assert join_fast(base, "//h.com/a/b/c#f") == "https://h.com/a/b/c"